@@ -17,6 +17,7 @@
 -- it get data from database (e.g., BQ) using NL2SQL
 -- then, it use NL2Py to do further data analysis as needed
 """
+import functools
 import os
 from datetime import date
 
@@ -36,13 +37,36 @@ from .tools import call_db_agent, call_ds_agent
 date_today = date.today()
 
 
+_DEFAULT_DB = "BigQuery"
+
+# Near-deterministic sampling, built once at import.
+_GEN_CFG = types.GenerateContentConfig(temperature=0.01)
+
+_SCHEMA_HEADER = """
+
+    --------- The BigQuery schema of the relevant data with a few sample rows. ---------
+    """
+_SCHEMA_FOOTER = """
+
+    """
+
+
+@functools.lru_cache(maxsize=4)
+def _build_instruction(schema: str) -> str:
+    """Build the root instruction with the database schema appended.
+
+    Memoized so that every session sharing a schema gets the very same
+    instruction string, which keeps the prompt prefix stable across calls.
+    """
+    return "".join((return_instructions_root(), _SCHEMA_HEADER, schema, _SCHEMA_FOOTER))
+
+
 def setup_before_agent_call(callback_context: CallbackContext):
     """Setup the agent."""
 
     # setting up database settings in session.state
     if "database_settings" not in callback_context.state:
-        db_settings = dict()
-        db_settings["use_database"] = "BigQuery"
+        db_settings = {"use_database": _DEFAULT_DB}
         callback_context.state["all_db_settings"] = db_settings
 
     # setting up schema in instruction
@@ -50,14 +74,8 @@ def setup_before_agent_call(callback_context: CallbackContext):
         callback_context.state["database_settings"] = get_bq_database_settings()
         schema = callback_context.state["database_settings"]["bq_ddl_schema"]
 
-        callback_context._invocation_context.agent.instruction = (
-            return_instructions_root()
-            + f"""
-
-    --------- The BigQuery schema of the relevant data with a few sample rows. ---------
-    {schema}
-
-    """
+        callback_context._invocation_context.agent.instruction = _build_instruction(
+            schema
         )
 
 
@@ -78,5 +96,5 @@ root_agent = Agent(
         load_artifacts,
     ],
     before_agent_callback=setup_before_agent_call,
-    generate_content_config=types.GenerateContentConfig(temperature=0.01),
+    generate_content_config=_GEN_CFG,
 )
@@ -17,93 +17,143 @@
 -- it get data from database (e.g., BQ) using NL2SQL
 -- then, it use NL2Py to do further data analysis as needed
 """
+import functools
+import logging
 import os
+import threading
 from datetime import date
+from typing import Optional
 
 from google.genai import types
 
 from google.adk.agents import Agent
 from google.adk.agents.callback_context import CallbackContext
-from google.adk.tools import load_artifacts, google_search
+from google.adk.tools import load_artifacts
 
 from .sub_agents.bigquery.tools import get_database_settings
 
-from .prompts import build_orchestrator_prompt
+from .prompts import (
+    BASIC_DATA_SOURCES,
+    DEFAULT_DATA_SOURCES,
+    ORCHESTRATOR_PROMPT,
+    build_orchestrator_prompt,
+)
 from .tools import (
+    AGENT_PROFILE,
+    ROOT_AGENT_MODEL,
+    batch_invoke,
     call_db_agent,
     call_ds_agent,
+    call_ds_agent_batch,
     get_store_description,
     call_search_agent,
 )
 
-date_today = date.today()
-
-data_sources = {
-    "Retrieve Data": {
-        "tool_name": "call_db_agent",
-        "description": "If you need to query the database, use this tool. Make sure to provide a proper SQL query to it to fulfill the task.",
-        "usage_summary": "Once you return the answer, provide additional explanations.",
-        "key_reminder": "DO NOT generate SQL code, ALWAYS USE call_db_agent to generate the SQL if needed."
-    },
-    "Get Store Info": {
-        "tool_name": "get_store_description",
-        "description": "If you need text description about available stores, use this tool to retrieve all descriptions.",
-        "usage_summary": "Use store details to recommend appropriate options or explain differences between stores.",
-        "key_reminder": "ALWAYS reference specific store features and specialties when making recommendations based on store information."
-    },
-    "Perform Google Search": {
-        "tool_name": "call_search_agent",
-        "description": "If the user EXPLICITLY requests to search for external information or if the question clearly requires up-to-date information beyond today's date, use this tool.",
-        "usage_summary": "After receiving search results, critically evaluate the information before incorporating it into your response.",
-        "key_reminder": "DO NOT use search unless explicitly requested by the user or absolutely necessary for time-sensitive information. Always prioritize internal data sources first."
-    }
-}
-
-# Example usage of build_orchestrator_prompt with data_sources
-orchestrator_prompt = build_orchestrator_prompt(available_data_sources=data_sources)
+# The default "search" profile uses the prompt precomputed at import
+if AGENT_PROFILE == "search":
+    data_sources = DEFAULT_DATA_SOURCES
+    orchestrator_prompt = ORCHESTRATOR_PROMPT
+else:
+    data_sources = BASIC_DATA_SOURCES
+    orchestrator_prompt = build_orchestrator_prompt(
+        available_data_sources=data_sources
+    )
+
+
+_DEFAULT_DB = "BigQuery"
+
+# Near-deterministic sampling, built once at import. Tool responses
+# are cached (see shared_libraries.response_cache) on the assumption that the
+# same question yields the same answer: raising the temperature here means
+# that cache must be cleared or disabled.
+_GEN_CFG = types.GenerateContentConfig(temperature=0.01)
+
+_SCHEMA_HEADER = """
+
+    --------- The BigQuery schema of the relevant data with a few sample rows. ---------
+    """
+_SCHEMA_FOOTER = """
+
+    """
+
+
+@functools.lru_cache(maxsize=4)
+def _build_instruction(schema: Optional[str], today: date) -> str:
+    """Build the root instruction with the database schema and date appended.
+
+    Parts are ordered from most to least stable (orchestrator prompt, schema,
+    today's date) so that calls share the longest possible prompt prefix.
+    Without a schema, only the date is appended. Memoized so that every
+    session on the same schema and day gets the very same instruction string.
+    """
+    schema_parts = (
+        (_SCHEMA_HEADER, schema, _SCHEMA_FOOTER) if schema is not None else ("\n",)
+    )
+    return "".join(
+        (orchestrator_prompt, *schema_parts, f"Todays date: {today}\n")
+    )
+
 
 def setup_before_agent_call(callback_context: CallbackContext):
     """Setup the agent."""
 
     # setting up database settings in session.state
     if "database_settings" not in callback_context.state:
-        db_settings = dict()
-        db_settings["use_database"] = "BigQuery"
+        db_settings = {"use_database": _DEFAULT_DB}
         callback_context.state["all_db_settings"] = db_settings
 
     # setting up schema in instruction
+    schema = None
     if callback_context.state["all_db_settings"]["use_database"] == "BigQuery":
-        callback_context.state["database_settings"] = get_database_settings()
-        schema = callback_context.state["database_settings"]["bq_ddl_schema"]
-
-        callback_context._invocation_context.agent.instruction = (
-            orchestrator_prompt
-            + f"""
+        database_settings = get_database_settings()
+        # Only write the settings to state when they changed, e.g. after a refresh
+        if callback_context.state.get("database_settings") is not database_settings:
+            callback_context.state["database_settings"] = database_settings
+        schema = database_settings["bq_ddl_schema"]
 
-    --------- The BigQuery schema of the relevant data with a few sample rows. ---------
-    {schema}
-
-    """
-        )
+    # Every instruction ends with today's date, with or without a schema
+    callback_context._invocation_context.agent.instruction = _build_instruction(
+        schema, date.today()
+    )
 
 
 root_agent = Agent(
-    model=os.getenv("ROOT_AGENT_MODEL"),
+    model=ROOT_AGENT_MODEL,
     name="medo_agent",
     instruction=orchestrator_prompt,
     global_instruction=(
-        f"""
+        """
         You are a Data Science and Data Analytics Multi Agent System.
-        Todays date: {date_today}
         """
     ),
     tools=[
         call_db_agent,
         call_ds_agent,
+        call_ds_agent_batch,
         load_artifacts,
-        get_store_description,
-        call_search_agent,
-    ],
+        batch_invoke,
+    ]
+    + (
+        [get_store_description, call_search_agent]
+        if AGENT_PROFILE == "search"
+        else []
+    ),
     before_agent_callback=setup_before_agent_call,
-    generate_content_config=types.GenerateContentConfig(temperature=0.01),
+    generate_content_config=_GEN_CFG,
 )
+
+
+def prewarm() -> None:
+    """Fetch the database settings and build today's root instruction.
+
+    Lets the first session skip the BigQuery metadata fetch.
+    """
+    try:
+        schema = get_database_settings()["bq_ddl_schema"]
+        _build_instruction(schema, date.today())
+    except Exception:  # pylint: disable=broad-exception-caught
+        logging.exception("Prewarming the medo agent failed")
+
+
+if os.getenv("MEDO_PREWARM", "").lower() in ("1", "true"):
+    threading.Thread(target=prewarm, name="medo-prewarm", daemon=True).start()
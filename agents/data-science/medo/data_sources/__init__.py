@@ -4,10 +4,11 @@ Data source providers package for connecting to various data sources.
 
 from .base import DataSourceProvider
 from .registry import DataSourceRegistry
-from .bq_source import BigQueryDataSource
+from .bq_source import BIGQUERY_SOURCE, BigQueryDataSource
 
 __all__ = [
     'DataSourceProvider',
     'DataSourceRegistry',
     'BigQueryDataSource',
+    'BIGQUERY_SOURCE',
 ]
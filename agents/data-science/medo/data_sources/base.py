@@ -2,17 +2,41 @@
 Base provider interface for data sources.
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Protocol
 
+# Methods every provider must implement itself
+REQUIRED_METHODS = ("get_name", "get_settings", "get_schema", "get_capabilities")
 
-class DataSourceProvider(ABC):
+
+class DataSourceProvider(Protocol):
     """
-    Abstract base class for data source providers.
-    All data source implementations should inherit from this class.
+    Interface for data source providers.
+    Data source implementations only need to provide these methods; they
+    may subclass this protocol to inherit the default `validate_connection`.
     """
     
-    @abstractmethod
+    __slots__ = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        """
+        Check once, at class creation, that a concrete subclass implements
+        the required methods instead of inheriting the empty protocol stubs.
+        
+        Raises:
+            TypeError: If a required method is not implemented
+        """
+        super().__init_subclass__(**kwargs)
+        if cls._is_protocol:
+            return
+        missing = [
+            name for name in REQUIRED_METHODS
+            if getattr(cls, name) is getattr(DataSourceProvider, name)
+        ]
+        if missing:
+            raise TypeError(
+                f"{cls.__name__} must implement: {', '.join(missing)}"
+            )
+    
     def get_name(self) -> str:
         """
         Get the name of this data source.
@@ -20,9 +44,8 @@ class DataSourceProvider(ABC):
         Returns:
             str: The data source name
         """
-        pass
+        ...
     
-    @abstractmethod
     def get_settings(self) -> Dict:
         """
         Get the settings for this data source.
@@ -30,9 +53,8 @@ class DataSourceProvider(ABC):
         Returns:
             Dict: A dictionary containing the data source settings
         """
-        pass
+        ...
     
-    @abstractmethod
     def get_schema(self) -> str:
         """
         Get the schema information for this data source.
@@ -40,9 +62,8 @@ class DataSourceProvider(ABC):
         Returns:
             str: The schema information as a formatted string
         """
-        pass
+        ...
     
-    @abstractmethod
     def get_capabilities(self) -> Dict:
         """
         Get the capabilities information for the orchestrator prompt builder.
@@ -50,7 +71,7 @@ class DataSourceProvider(ABC):
         Returns:
             Dict: A dictionary containing capability definitions
         """
-        pass
+        ...
     
     def validate_connection(self) -> bool:
         """
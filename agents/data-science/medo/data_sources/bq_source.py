@@ -2,17 +2,53 @@
 BigQuery data source implementation.
 """
 
-from typing import Dict
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping
 
 from ..sub_agents.bigquery.tools import get_database_settings
-from .base import DataSourceProvider
 
 
-class BigQueryDataSource(DataSourceProvider):
+class BigQueryDataSource:
     """
     BigQuery data source provider implementation.
     """
     
+    __slots__ = ()
+    
+    _NAME = sys.intern("BigQuery")
+    _TOOL_NAME = sys.intern("call_db_agent")
+    
+    # Capabilities are static, so they are built once and shared read-only
+    _CAPS = MappingProxyType({
+        "Retrieve SQL Data": MappingProxyType({
+            "tool_name": _TOOL_NAME,
+            "description": "If you need to query the BigQuery database, use this tool. Make sure to provide a proper SQL query to fulfill the task.",
+            "usage_summary": "Once you return the answer, provide additional explanations.",
+            "key_reminder": "DO NOT generate SQL code, ALWAYS USE call_db_agent to generate the SQL if needed."
+        }),
+        "SQL Database": MappingProxyType({
+            "tool_name": _TOOL_NAME,
+            "description": "If the question needs SQL executions, forward it to the database agent.",
+            "usage_summary": "Used for database queries that can be solved with SQL."
+        }),
+        "SQL & Analysis": MappingProxyType({
+            "tool_name": _TOOL_NAME,
+            "description": "If the question needs SQL execution and additional analysis, first forward it to the database agent to retrieve the data.",
+            "usage_summary": "For compound questions requiring both SQL and further analysis, first use this to get the data."
+        }),
+    })
+    
+    def __new__(cls):
+        """
+        Return the single shared instance of this stateless provider.
+        """
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+    
     def get_name(self) -> str:
         """
         Get the name of this data source.
@@ -20,7 +56,7 @@ class BigQueryDataSource(DataSourceProvider):
         Returns:
             str: The data source name
         """
-        return "BigQuery"
+        return self._NAME
     
     def get_settings(self) -> Dict:
         """
@@ -36,37 +72,23 @@ class BigQueryDataSource(DataSourceProvider):
         """
         Get the schema information for this data source.
         
+        The schema comes from the process-wide, TTL-refreshed database
+        settings, so repeated calls do not hit BigQuery.
+        
         Returns:
             str: The BigQuery schema information as a formatted string
         """
         settings = self.get_settings()
         return settings.get("bq_ddl_schema", "")
     
-    def get_capabilities(self) -> Dict:
+    def get_capabilities(self) -> Mapping:
         """
         Get the capabilities information for the orchestrator prompt builder.
         
         Returns:
-            Dict: A dictionary containing BigQuery capability definitions
+            Mapping: A read-only mapping of BigQuery capability definitions
         """
-        return {
-            "Retrieve SQL Data": {
-                "tool_name": "call_db_agent",
-                "description": "If you need to query the BigQuery database, use this tool. Make sure to provide a proper SQL query to fulfill the task.",
-                "usage_summary": "Once you return the answer, provide additional explanations.",
-                "key_reminder": "DO NOT generate SQL code, ALWAYS USE call_db_agent to generate the SQL if needed."
-            },
-            "SQL Database": {
-                "tool_name": "call_db_agent", 
-                "description": "If the question needs SQL executions, forward it to the database agent.",
-                "usage_summary": "Used for database queries that can be solved with SQL."
-            },
-            "SQL & Analysis": {
-                "tool_name": "call_db_agent",
-                "description": "If the question needs SQL execution and additional analysis, first forward it to the database agent to retrieve the data.",
-                "usage_summary": "For compound questions requiring both SQL and further analysis, first use this to get the data."
-            }
-        }
+        return self._CAPS
     
     def validate_connection(self) -> bool:
         """
@@ -78,3 +100,7 @@ class BigQueryDataSource(DataSourceProvider):
         # In a real implementation, we would check if we can connect to BigQuery
         # For now, just return True
         return True
+
+
+# The shared instance (BigQueryDataSource() always returns it)
+BIGQUERY_SOURCE = BigQueryDataSource()
@@ -2,7 +2,13 @@
 Registry for managing data source providers.
 """
 
-from typing import Dict, List, Any, Optional
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+from ..shared_libraries import state_keys
+from .base import DataSourceProvider
 
 class DataSourceRegistry:
     """
@@ -12,18 +18,20 @@ class DataSourceRegistry:
     """
     
     # State key constants
-    ACTIVE_SOURCE_KEY = "active_data_source"
-    ACTIVE_SOURCES_KEY = "active_data_sources"
-    SOURCE_SETTINGS_PREFIX = "source_settings_"
-    ALL_DB_SETTINGS_KEY = "all_db_settings"
+    ACTIVE_SOURCE_KEY = state_keys.ACTIVE_SOURCE_KEY
+    ACTIVE_SOURCES_KEY = state_keys.ACTIVE_SOURCES_KEY
+    SOURCE_SETTINGS_PREFIX = state_keys.SOURCE_SETTINGS_PREFIX
+    ALL_DB_SETTINGS_KEY = state_keys.ALL_DB_SETTINGS_KEY
     
     def __init__(self):
         """
         Initialize an empty registry.
         """
         self._sources = {}
+        # Names are read far more often than sources are (un)registered
+        self._names: Tuple[str, ...] = ()
     
-    def register(self, source):
+    def register(self, source: DataSourceProvider):
         """
         Register a data source provider.
         
@@ -31,6 +39,7 @@ class DataSourceRegistry:
             source: A data source provider implementing the required interface
         """
         self._sources[source.get_name()] = source
+        self._names = tuple(self._sources)
     
     def unregister(self, name: str):
         """
@@ -41,6 +50,7 @@ class DataSourceRegistry:
         """
         if name in self._sources:
             del self._sources[name]
+            self._names = tuple(self._sources)
     
     def get_source(self, name: str):
         """
@@ -54,23 +64,57 @@ class DataSourceRegistry:
         """
         return self._sources.get(name)
     
-    def get_all_sources(self) -> Dict:
+    def get_all_sources(self) -> Mapping:
         """
         Get all registered data sources.
         
         Returns:
-            Dict: A dictionary of all registered data sources
+            Mapping: A read-only view of all registered data sources
         """
-        return self._sources
+        return MappingProxyType(self._sources)
     
-    def get_all_source_names(self) -> List[str]:
+    def get_all_source_names(self) -> Tuple[str, ...]:
         """
         Get the names of all registered data sources.
         
         Returns:
-            List[str]: A list of data source names
+            Tuple[str, ...]: The data source names in registration order
+        """
+        return self._names
+    
+    def fetch_sources(self, source_names) -> Dict[str, Tuple[Dict, Mapping, str]]:
+        """
+        Fetch settings, capabilities and schema of several data sources.
+        
+        Sources are fetched concurrently, since each may need a round trip
+        to its backend; the total latency is that of the slowest source.
+        
+        Args:
+            source_names: Names of the data sources to fetch
+            
+        Returns:
+            Dict: Maps each found source name to its
+                (settings, capabilities, schema) tuple
         """
-        return list(self._sources.keys())
+        sources = {}
+        for name in source_names:
+            source = self._sources.get(name)
+            if source:
+                sources[name] = source
+            else:
+                logging.warning(f"Data source '{name}' not found. Skipping it.")
+        if not sources:
+            return {}
+        
+        def fetch(source):
+            return source.get_settings(), source.get_capabilities(), source.get_schema()
+        
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = {
+                name: executor.submit(fetch, source)
+                for name, source in sources.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
     
     def source_exists(self, name: str) -> bool:
         """
@@ -134,7 +178,7 @@ class DataSourceRegistry:
             context: The callback or tool context
         """
         if self.ACTIVE_SOURCES_KEY not in context.state:
-            context.state[self.ACTIVE_SOURCES_KEY] = self.get_all_source_names()
+            context.state[self.ACTIVE_SOURCES_KEY] = list(self._names)
             
     def add_active_source(self, context, source_name: str) -> bool:
         """
@@ -151,11 +195,10 @@ class DataSourceRegistry:
             return False
             
         active_sources = self.get_active_sources(context)
-        if source_name not in active_sources:
-            active_sources.append(source_name)
-            context.state[self.ACTIVE_SOURCES_KEY] = active_sources
-            return True
-        return False
+        if source_name in active_sources:
+            return False
+        context.state[self.ACTIVE_SOURCES_KEY] = [*active_sources, source_name]
+        return True
     
     def remove_active_source(self, context, source_name: str) -> bool:
         """
@@ -168,20 +211,22 @@ class DataSourceRegistry:
         Returns:
             bool: True if removed, False if not in list
         """
-        active_sources = self.get_active_sources(context)
-        if source_name in active_sources:
-            active_sources.remove(source_name)
-            context.state[self.ACTIVE_SOURCES_KEY] = active_sources
-            
-            # If removing current active source, select a new one if available
-            if self.get_active_source(context) == source_name:
-                if active_sources:
-                    context.state[self.ACTIVE_SOURCE_KEY] = active_sources[0]
-                elif self.ACTIVE_SOURCE_KEY in context.state:
-                    del context.state[self.ACTIVE_SOURCE_KEY]
-            
-            return True
-        return False
+        state = context.state
+        active_sources = state.get(self.ACTIVE_SOURCES_KEY, [])
+        if source_name not in active_sources:
+            return False
+        
+        active_sources = [name for name in active_sources if name != source_name]
+        state[self.ACTIVE_SOURCES_KEY] = active_sources
+        
+        # If removing current active source, select a new one if available
+        if state.get(self.ACTIVE_SOURCE_KEY) == source_name:
+            if active_sources:
+                state[self.ACTIVE_SOURCE_KEY] = active_sources[0]
+            else:
+                del state[self.ACTIVE_SOURCE_KEY]
+        
+        return True
     
     def get_source_settings(self, context, source_name: str = None) -> Dict:
         """
@@ -194,25 +239,29 @@ class DataSourceRegistry:
         Returns:
             Dict: The data source settings
         """
+        state = context.state
+        
         # Use provided source name, active source, or default to first available
-        source_name = source_name or self.get_active_source(context)
-        if not source_name and self.get_all_source_names():
-            source_name = self.get_all_source_names()[0]
+        source_name = source_name or state.get(self.ACTIVE_SOURCE_KEY)
+        if not source_name and self._names:
+            source_name = self._names[0]
             
         if not source_name:
             return {}
             
         # Check if settings are already in state
         key = f"{self.SOURCE_SETTINGS_PREFIX}{source_name}"
-        if key not in context.state:
+        settings = state.get(key)
+        if settings is None:
             # Get and store settings from source
             source = self.get_source(source_name)
-            if source:
-                context.state[key] = source.get_settings()
-            else:
+            if not source:
                 logging.warning(f"Data source '{source_name}' not found. Unable to retrieve settings.")
+                return {}
+            settings = source.get_settings()
+            state[key] = settings
                 
-        return context.state.get(key, {})
+        return settings
     
     def get_all_db_settings(self, context) -> Dict:
         """
@@ -1,30 +1,75 @@
-def build_orchestrator_prompt(
-    available_data_sources=None
-) -> str:
+import dataclasses
+import functools
+from types import MappingProxyType
+from typing import Optional, Tuple
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Capability:
     """
-    Dynamically builds the main orchestrator prompt with injected data sources.
-    
-    Parameters:
-    - available_data_sources: Dict of data sources and their capabilities
-    
-    Returns:
-    - str: The formatted orchestrator prompt
+    A data source capability advertised in the orchestrator prompt.
+
+    Attributes:
+    - tool_name: Name of the tool that serves this capability
+    - description: When the orchestrator should use the tool
+    - usage_summary: How to use the tool's answer (optional)
+    - key_reminder: Rule added to the prompt's key reminders (optional)
     """
-    
-    # Define default tool names and descriptions (as variables for future extensibility)
-    default_ds_tool_name = "call_ds_agent"
-    default_ds_tool_desc = "If you need to run data science tasks and python analysis, use this tool. Make sure to provide a proper query to it to fulfill the task."
-    
-    # Base orchestrator role (data source agnostic)
-    base_prompt = """
+
+    tool_name: str
+    description: str
+    usage_summary: Optional[str] = None
+    key_reminder: Optional[str] = None
+
+
+# Default data science tool (as variables for future extensibility)
+DS_TOOL_NAME = "call_ds_agent"
+DS_TOOL_DESC = "If you need to run data science tasks and python analysis, use this tool. Make sure to provide a proper query to it to fulfill the task."
+
+# Usage summary for capabilities that do not provide their own
+DEFAULT_USAGE_SUMMARY = "Once you return the answer, provide additional explanations."
+
+# Orchestrator role, constraints and reminders that do not depend on the data
+# sources. Every orchestrator prompt starts with this exact text, so providers
+# can serve it from their prompt prefix cache.
+STATIC_PREFIX = f"""
     You are a senior data scientist tasked to accurately classify the user's intent regarding available data sources and formulate specific questions suitable for the appropriate data agents.
     - The data agents have access to the data sources specified below.
     - If the user asks questions that can be answered directly from the available data schemas, answer it directly without calling any additional agents.
     - If the question is a compound question that goes beyond simple data access, rewrite the question into parts suitable for the appropriate data agents. Call the necessary data agents as needed.
     - IMPORTANT: be precise! If the user asks for a dataset, provide the name. Don't call any additional agent if not absolutely necessary!
 
+    <CONSTRAINTS>
+        * **Schema Adherence:**  **Strictly adhere to the provided schema.**  Do not invent or assume any data or schema elements beyond what is given.
+        * **Prioritize Clarity:** If the user's intent is too broad or vague (e.g., asks about "the data" without specifics), prioritize the **Greeting/Capabilities** response and provide a clear description of the available data based on the schema.
+    </CONSTRAINTS>
+
     <TASK>
 
+        # **Response Format:** Return `RESULT` AND `EXPLANATION`, and optionally `GRAPH` if there are any. Please USE the MARKDOWN format (not JSON) with the following sections:
+
+        #     * **Result:**  "Natural language summary of the data agent findings"
+
+        #     * **Explanation:**  "Step-by-step explanation of how the result was derived.",
+
+        #     * **All responses must include specific numbers, facts, or quantitative evidence to support conclusions.**
+
+        **Key Reminder:**
+        * **You do have access to the data schemas! Use your own information first before asking data agents about schemas!**
+        * **DO NOT generate code; always delegate analysis to `{DS_TOOL_NAME}`, including follow-up analyses that reuse prior step data.**
+        * **If `call_db_agent` already produced a final natural-language answer, DO NOT call `{DS_TOOL_NAME}` with `N/A`; just respond.**
+        * **DO NOT ask the user for project or dataset ID. You have these details in the session context.**
+        * **If you need several tool calls that do not depend on each other's results, emit them inside a single `batch_invoke` call so they run concurrently.**
+        * **If a compound question needs several independent analyses of the same data, pass them together to `call_ds_agent_batch`.**
+        * **ALWAYS include specific numbers, statistics, or factual evidence in your answers and justifications when available.**
+"""
+
+
+# Source-dependent part of the prompt, including all numbered steps. Kept as a
+# str.format template: jinja2 is not a dependency, and each source
+# configuration is rendered only once (see _build_orchestrator_prompt).
+DYNAMIC_SUFFIX_TEMPLATE = """        {key_reminder_extras}
+
         # **Workflow:**
 
         # 1. **Understand Intent 
@@ -33,75 +78,141 @@ def build_orchestrator_prompt(
 
         # {ds_tool_step}. **Analyze Data TOOL (`{ds_tool_name}` - if applicable):**  {ds_tool_desc}
 
-        # {response_step}. **Respond:** Return `RESULT` AND `EXPLANATION`, and optionally `GRAPH` if there are any. Please USE the MARKDOWN format (not JSON) with the following sections:
+        # {response_step}. **Respond:** Follow the **Response Format** above.
 
-        #     * **Result:**  "Natural language summary of the data agent findings"
+        # **Tool Usage Summary:**
 
-        #     * **Explanation:**  "Step-by-step explanation of how the result was derived.",
+        {tool_usage_summary}
+    </TASK>
+    """
 
-        #     * **All responses must include specific numbers, facts, or quantitative evidence to support conclusions.**
 
-        # **Tool Usage Summary:**
+def _as_capability(source_info) -> Optional[Capability]:
+    """
+    Normalize a capability given as a Capability or as a provider's dict.
 
-        {tool_usage_summary}
-        {tool_usage_extras}
+    Returns:
+    - Capability, or None if the dict lacks a tool name or description
+    """
+    if isinstance(source_info, Capability):
+        return source_info
+    if 'tool_name' not in source_info or 'description' not in source_info:
+        return None
+    return Capability(
+        tool_name=source_info['tool_name'],
+        description=source_info['description'],
+        usage_summary=source_info.get('usage_summary'),
+        key_reminder=source_info.get('key_reminder'),
+    )
 
-        **Key Reminder:**
-        * **You do have access to the data schemas! Use your own information first before asking data agents about schemas!**
-        * **DO NOT generate code yourself. That is not your task. Use tools instead.**
-        * **DO NOT generate analysis code, ALWAYS USE {ds_tool_name} to generate further analysis if needed.**
-        * **IF {ds_tool_name} is called with valid result, JUST SUMMARIZE ALL RESULTS FROM PREVIOUS STEPS USING RESPONSE FORMAT!**
-        * **IF data is available from previous agent calls, YOU CAN DIRECTLY USE {ds_tool_name} TO DO NEW ANALYZE USING THE DATA FROM PREVIOUS STEPS**
-        * **DO NOT ask the user for project or dataset ID. You have these details in the session context.**
-        * **ALWAYS include specific numbers, statistics, or factual evidence in your answers and justifications when available.**
-        {key_reminder_extras}
-    </TASK>
+
+def build_orchestrator_prompt(
+    available_data_sources=None
+) -> str:
+    """
+    Dynamically builds the main orchestrator prompt with injected data sources.
+    
+    Parameters:
+    - available_data_sources: Mapping of data source names to their Capability
+      (or an equivalent capability dict)
+    
+    Returns:
+    - str: The formatted orchestrator prompt
+    """
+    sources = []
+    for source_name, source_info in (available_data_sources or {}).items():
+        capability = _as_capability(source_info)
+        if capability is not None:
+            sources.append((source_name, capability))
+    return _build_orchestrator_prompt(tuple(sources))
 
 
-    <CONSTRAINTS>
-        * **Schema Adherence:**  **Strictly adhere to the provided schema.**  Do not invent or assume any data or schema elements beyond what is given.
-        * **Prioritize Clarity:** If the user's intent is too broad or vague (e.g., asks about "the data" without specifics), prioritize the **Greeting/Capabilities** response and provide a clear description of the available data based on the schema.
-    </CONSTRAINTS>
+@functools.lru_cache(maxsize=64)
+def _build_orchestrator_prompt(
+    sources: Tuple[Tuple[str, Capability], ...]
+) -> str:
+    """
+    Builds the orchestrator prompt, memoized per data source configuration.
+    
+    Parameters:
+    - sources: (name, Capability) pairs, in the order they should be listed
+    
+    Returns:
+    - str: The formatted orchestrator prompt
     """
     
     # Generate data source instructions based on available sources
-    data_source_instructions = ""
-    tool_usage_summary = ""
-    tool_usage_extras = ""
-    key_reminder_extras = ""
+    data_source_instructions = []
+    tool_usage_summary = []
+    key_reminder_extras = []
     step_index = 2  # Start after "Understand Intent"
     
-    # Process available data sources
-    if available_data_sources:
-        for source_name, source_info in available_data_sources.items():
-            if 'tool_name' in source_info and 'description' in source_info:
-                data_source_instructions += f"# {step_index}. **{source_name} TOOL (`{source_info['tool_name']}` - if applicable):** {source_info['description']}\n\n"
-                step_index += 1
-                
-                # Add to tool usage summary
-                tool_usage_summary += f"#   * **{source_name}:** `{source_info['tool_name']}`. "
-                
-                if 'usage_summary' in source_info:
-                    tool_usage_summary += f"{source_info['usage_summary']}\n"
-                else:
-                    tool_usage_summary += f"Once you return the answer, provide additional explanations.\n"
-                
-                # Add to key reminders if provided
-                if 'key_reminder' in source_info:
-                    key_reminder_extras += f"* **{source_info['key_reminder']}**\n"
+    # Process available data sources. This runs once per source configuration
+    # (the prompt is memoized), and the f-strings' literal parts are code
+    # constants, so the lines are built directly.
+    for source_name, capability in sources:
+        data_source_instructions.append(f"# {step_index}. **{source_name} TOOL (`{capability.tool_name}` - if applicable):** {capability.description}\n\n")
+        step_index += 1
+        
+        # Add to tool usage summary
+        usage_summary = capability.usage_summary
+        if usage_summary is None:
+            usage_summary = DEFAULT_USAGE_SUMMARY
+        tool_usage_summary.append(f"#   * **{source_name}:** `{capability.tool_name}`. {usage_summary}\n")
+        
+        # Add to key reminders if provided
+        if capability.key_reminder is not None:
+            key_reminder_extras.append(f"* **{capability.key_reminder}**\n")
     
     # Calculate step numbers for data science tool and response
     ds_tool_step = step_index
     response_step = step_index + 1
     
     # Format the final prompt
-    return base_prompt.format(
-        data_source_instructions=data_source_instructions,
+    return STATIC_PREFIX + DYNAMIC_SUFFIX_TEMPLATE.format(
+        data_source_instructions="".join(data_source_instructions),
         ds_tool_step=ds_tool_step,
-        ds_tool_name=default_ds_tool_name,
-        ds_tool_desc=default_ds_tool_desc,
+        ds_tool_name=DS_TOOL_NAME,
+        ds_tool_desc=DS_TOOL_DESC,
         response_step=response_step,
-        tool_usage_summary=tool_usage_summary,
-        tool_usage_extras=tool_usage_extras,
-        key_reminder_extras=key_reminder_extras
+        tool_usage_summary="".join(tool_usage_summary),
+        key_reminder_extras="".join(key_reminder_extras)
     )
+
+
+# Capabilities of the database and analysis tools, available in every profile
+BASIC_DATA_SOURCES = MappingProxyType({
+    "Retrieve Data": Capability(
+        tool_name="call_db_agent",
+        description="If you need to query the database, use this tool. Make sure to provide a proper SQL query to it to fulfill the task.",
+        usage_summary="Once you return the answer, provide additional explanations.",
+        key_reminder="DO NOT generate SQL code, ALWAYS USE call_db_agent to generate the SQL if needed."
+    ),
+})
+
+# Capabilities added by the "search" profile
+SEARCH_DATA_SOURCES = MappingProxyType({
+    "Get Store Info": Capability(
+        tool_name="get_store_description",
+        description="If you need text description about available stores, use this tool to retrieve all descriptions.",
+        usage_summary="Use store details to recommend appropriate options or explain differences between stores.",
+        key_reminder="ALWAYS reference specific store features and specialties when making recommendations based on store information."
+    ),
+    "Perform Google Search": Capability(
+        tool_name="call_search_agent",
+        description="If the user EXPLICITLY requests to search for external information or if the question clearly requires up-to-date information beyond today's date, use this tool.",
+        usage_summary="After receiving search results, critically evaluate the information before incorporating it into your response.",
+        key_reminder="DO NOT use search unless explicitly requested by the user or absolutely necessary for time-sensitive information. Always prioritize internal data sources first."
+    ),
+})
+
+# Data sources of the default agent configuration
+DEFAULT_DATA_SOURCES = MappingProxyType({
+    **BASIC_DATA_SOURCES,
+    **SEARCH_DATA_SOURCES,
+})
+
+# Orchestrator prompt for DEFAULT_DATA_SOURCES, built once at import
+ORCHESTRATOR_PROMPT = build_orchestrator_prompt(
+    available_data_sources=DEFAULT_DATA_SOURCES
+)
@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Store of previously answered questions, used as few-shot examples.
+
+Similar questions are found by the overlap of their normalized words and
+symbols. This is cheap enough to run on every call and needs no embedding
+model.
+"""
+
+import collections
+import heapq
+import re
+import time
+from typing import Hashable, List, Optional, Tuple
+
+from .response_cache import normalize_question
+
+# Words and runs of symbols, so that e.g. ">" and "<" are tokens of their own
+_TOKENS = re.compile(r"\w+|[^\w\s]+")
+
+
+def _tokens(question: str) -> frozenset:
+    """Tokens of a question after normalization."""
+    return frozenset(_TOKENS.findall(normalize_question(question)))
+
+
+class ExampleStore:
+    """Bounded store of (question, answer) pairs, searched by word overlap.
+
+    Examples are recorded and searched within a scope, e.g. the data source
+    and dataset that the answer was produced against.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: Optional[float] = None,
+        min_similarity: float = 0.5,
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            maxsize: Maximum number of examples kept before dropping the
+                least recently recorded one
+            ttl: Seconds an example stays valid, or None to never expire
+            min_similarity: Smallest Jaccard similarity between the tokens
+                of two questions for one to be an example for the other
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._min_similarity = min_similarity
+        self._examples = collections.OrderedDict()
+
+    def add(self, scope: Hashable, question: str, answer: str) -> None:
+        """Record an answered question, replacing an earlier equal one."""
+        tokens = _tokens(question)
+        if not tokens:
+            return
+        key = (scope, normalize_question(question))
+        expires_at = None if self._ttl is None else time.monotonic() + self._ttl
+        self._examples[key] = (expires_at, tokens, question, answer)
+        self._examples.move_to_end(key)
+        if len(self._examples) > self._maxsize:
+            self._examples.popitem(last=False)
+
+    def search(
+        self, scope: Hashable, question: str, k: int = 3
+    ) -> List[Tuple[str, str]]:
+        """
+        Find the recorded questions in `scope` most similar to `question`.
+
+        Returns:
+            Up to k (question, answer) pairs, most similar first
+        """
+        tokens = _tokens(question)
+        if not tokens:
+            return []
+        now = time.monotonic()
+        expired = []
+        scored = []
+        for key, entry in self._examples.items():
+            expires_at, example_tokens, example_question, answer = entry
+            if expires_at is not None and expires_at < now:
+                expired.append(key)
+                continue
+            if key[0] != scope:
+                continue
+            similarity = len(tokens & example_tokens) / len(tokens | example_tokens)
+            if similarity >= self._min_similarity:
+                scored.append((similarity, example_question, answer))
+        for key in expired:
+            del self._examples[key]
+        return [
+            (example_question, answer)
+            for _, example_question, answer in heapq.nlargest(
+                k, scored, key=lambda item: item[0]
+            )
+        ]
+
+    def clear(self) -> None:
+        """Drop every example."""
+        self._examples.clear()
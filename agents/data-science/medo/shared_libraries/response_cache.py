@@ -0,0 +1,187 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Response cache for the orchestrator's agent tools.
+
+Questions are normalized (case, whitespace, trailing sentence punctuation)
+before lookup so that trivially rephrased repeats are answered without
+re-running the sub-agent. Everything else is kept verbatim: "top 10
+customers" and "top 20 customers", or "sales > 1000" and "sales < 1000",
+must never share an answer.
+"""
+
+import collections
+import functools
+import hashlib
+import logging
+import re
+import time
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from google.adk.tools import ToolContext
+
+from .state_keys import ACTIVE_SOURCE_KEY, ALL_DB_SETTINGS_KEY
+
+_WHITESPACE = re.compile(r"\s+")
+# Sentence-ending punctuation; operators, signs and "%" carry meaning and stay
+_TRAILING_PUNCTUATION = "?!. "
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so trivially different phrasings share a key."""
+    text = _WHITESPACE.sub(" ", question.lower()).strip()
+    return text.rstrip(_TRAILING_PUNCTUATION)
+
+
+def fingerprint(value: Any) -> str:
+    """Short content digest of a value, e.g. a query result."""
+    return hashlib.sha256(repr(value).encode()).hexdigest()
+
+
+def _cache_key(*parts: Any) -> str:
+    """Content-addressed cache key; its size does not grow with the parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU cache of tool responses with an optional time-to-live."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the
+                least recently used one
+            ttl: Seconds an entry stays valid, or None to never expire
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries = collections.OrderedDict()
+
+    def get(self, key) -> Any:
+        """
+        Look up an entry, dropping it if it has expired.
+
+        Returns:
+            The cached value or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        """Store an entry, evicting the least recently used one if full."""
+        expires_at = None if self._ttl is None else time.monotonic() + self._ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+
+def active_source(tool_context: ToolContext) -> Optional[str]:
+    """Name of the data source the question is being answered against."""
+    state = tool_context.state
+    active_source = state.get(ACTIVE_SOURCE_KEY)
+    if active_source:
+        return active_source
+    return state.get(ALL_DB_SETTINGS_KEY, {}).get("use_database")
+
+
+def cached_tool(
+    cache: ResponseCache,
+    state_keys: Sequence[str] = (),
+    context_keys: Sequence[str] = (),
+    required_keys: Sequence[str] = (),
+    scope: Optional[Callable[[ToolContext], Hashable]] = None,
+):
+    """Serve repeated questions to an async agent tool from `cache`.
+
+    The wrapped tool must take `(question, tool_context)`. Entries are keyed
+    by a SHA-256 digest of the tool name, scope, normalized question and
+    context values.
+
+    Empty responses are not cached, and neither are responses of calls that
+    saved artifacts: an answer referring to, e.g., a chart would be replayed
+    in sessions that never received the chart.
+
+    Args:
+        cache: The cache holding this tool's responses.
+        state_keys: Session state keys the tool writes. Their values after
+            the call are stored with the response and restored on a cache
+            hit.
+        context_keys: Session state keys the response depends on. Their
+            values become part of the cache key, so prefer small ones such
+            as a fingerprint of a large value.
+        required_keys: Session state keys a successful call writes. The
+            response is only cached if the call wrote a new value to each of
+            them, e.g. a query result that a failed query leaves untouched.
+        scope: Returns what, besides the session state, the response was
+            computed against, e.g. the data source and dataset queried.
+            Defaults to the active data source.
+    """
+    scope = scope or active_source
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(question: str, tool_context: ToolContext):
+            state = tool_context.state
+            key = _cache_key(
+                func.__name__,
+                scope(tool_context),
+                normalize_question(question),
+                *(state.get(k) for k in context_keys),
+            )
+
+            cached = cache.get(key)
+            if cached is not None:
+                output, state_delta = cached
+                logging.info("%s: serving cached response", func.__name__)
+                for k, value in state_delta.items():
+                    state[k] = value
+                return output
+
+            required_before = {k: state.get(k) for k in required_keys}
+            artifacts_before = dict(tool_context.actions.artifact_delta)
+            output = await func(question, tool_context)
+            # A new value is a new object, even if it equals the old one
+            wrote_required_keys = all(
+                state.get(k) is not None and state.get(k) is not required_before[k]
+                for k in required_keys
+            )
+            saved_artifacts = tool_context.actions.artifact_delta != artifacts_before
+            if output and wrote_required_keys and not saved_artifacts:
+                # Every key is stored, even if this call left it unchanged:
+                # the entry is replayed into sessions that never held it.
+                state_delta = {k: state.get(k) for k in state_keys}
+                cache.put(key, (output, state_delta))
+            return output
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,23 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Session state keys shared by the data sources and the tools.
+
+Kept free of imports so that reading a key never builds a data source.
+"""
+
+ACTIVE_SOURCE_KEY = "active_data_source"
+ACTIVE_SOURCES_KEY = "active_data_sources"
+SOURCE_SETTINGS_PREFIX = "source_settings_"
+ALL_DB_SETTINGS_KEY = "all_db_settings"
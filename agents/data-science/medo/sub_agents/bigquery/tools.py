@@ -18,6 +18,8 @@ import datetime
 import logging
 import os
 import re
+import threading
+import time
 
 from data_science.utils.utils import get_env_var
 from google.adk.tools import ToolContext
@@ -35,7 +37,14 @@ llm_client = Client(vertexai=True, project=project, location=region)
 MAX_NUM_ROWS = 80
 
 
+# Database settings are shared by all sessions in the process and refetched
+# once they are older than this, so schema changes are eventually picked up.
+DATABASE_SETTINGS_TTL_SECS = 300
+
 database_settings = None
+database_settings_key = None
+database_settings_expiry = 0.0
+database_settings_lock = threading.Lock()
 bq_client = None
 
 
@@ -48,16 +57,24 @@ def get_bq_client():
 
 
 def get_database_settings():
-    """Get database settings."""
+    """Get database settings, refetching them once they have expired."""
     global database_settings
-    if database_settings is None:
-        database_settings = update_database_settings()
-    return database_settings
+    key = (os.getenv("BQ_PROJECT_ID"), os.getenv("BQ_DATASET_ID"))
+    # Serialize refreshes so concurrent callers (e.g. the startup prewarm and
+    # the first session) share a single fetch.
+    with database_settings_lock:
+        if (
+            database_settings is None
+            or key != database_settings_key
+            or time.monotonic() >= database_settings_expiry
+        ):
+            database_settings = update_database_settings()
+        return database_settings
 
 
 def update_database_settings():
     """Update database settings."""
-    global database_settings
+    global database_settings, database_settings_key, database_settings_expiry
     ddl_schema = get_bigquery_schema(
         get_env_var("BQ_DATASET_ID"),
         client=get_bq_client(),
@@ -70,6 +87,11 @@ def update_database_settings():
         # Include ChaseSQL-specific constants.
         **chase_constants.chase_sql_constants_dict,
     }
+    database_settings_key = (
+        database_settings["bq_project_id"],
+        database_settings["bq_dataset_id"],
+    )
+    database_settings_expiry = time.monotonic() + DATABASE_SETTINGS_TTL_SECS
     return database_settings
 
 
@@ -277,7 +299,11 @@ def run_bigquery_validation(
 
     try:
         query_job = get_bq_client().query(sql_string)
-        results = query_job.result()  # Get the query results
+        # Only the first MAX_NUM_ROWS rows are used, so fetch just those in
+        # a single page instead of paging through the whole result set.
+        results = query_job.result(
+            max_results=MAX_NUM_ROWS, page_size=MAX_NUM_ROWS
+        )
 
         if results.schema:  # Check if query returned data
             rows = [
@@ -290,13 +316,12 @@ def run_bigquery_validation(
                     for (key, value) in row.items()
                 }
                 for row in results
-            ][
-                :MAX_NUM_ROWS
             ]  # Convert BigQuery RowIterator to list of dicts
             # return f"Valid SQL. Results: {rows}"
             final_result["query_result"] = rows
 
             tool_context.state["query_result"] = rows
+            tool_context.state["sql_query"] = sql_string
 
         else:
             final_result["error_message"] = (
@@ -17,32 +17,143 @@
 -- it get data from database (e.g., BQ) using NL2SQL
 -- then, it use NL2Py to do further data analysis as needed
 """
+import asyncio
+import csv
+import functools
+import inspect
+import io
+import logging
 import os
+from typing import Tuple
 
 from google.adk.tools import ToolContext
-from google.adk.agents import Agent
-from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 
+from .shared_libraries import (
+    ExampleStore,
+    ResponseCache,
+    active_source,
+    cached_tool,
+    fingerprint,
+)
 from .sub_agents import ds_agent, db_agent
 
+# Model of the root agent and its Google Search agent, read once at import
+ROOT_AGENT_MODEL = os.getenv("ROOT_AGENT_MODEL")
+
+# Selects the tool set: "basic" (database and analysis tools only) or
+# "search" (adds store descriptions and Google Search).
+AGENT_PROFILE = os.getenv("AGENT_PROFILE", "search")
+if AGENT_PROFILE not in ("basic", "search"):
+    raise ValueError(f"Unknown AGENT_PROFILE: {AGENT_PROFILE}")
+
+# AgentTool keeps no per-call state, so one wrapper per sub-agent is reused
+_DB_AGENT_TOOL = AgentTool(agent=db_agent)
+_DS_AGENT_TOOL = AgentTool(agent=ds_agent)
+
+# Repeated questions are answered from these caches instead of re-running the
+# sub-agents. Entries expire so that table updates and fresh search results
+# are eventually picked up.
+RESPONSE_CACHE_TTL_SECS = 300
+
+# Request sent to the data science agent; the query result is appended last
+_DS_REQUEST_PREAMBLE = """
+  Question to answer: {question}
+
+  Actual data to analyze previous question is already in the following{data_format}:
+  """
+
+# Data format noted in the request when the query result is sent as CSV
+_CSV_DATA_FORMAT = """
+  (CSV with a header row, where NULL marks a missing value)"""
+
+# Request sent to the database agent when similar questions were answered
+# before; the SQL that answered them serves as few-shot examples.
+_DB_REQUEST_WITH_EXAMPLES = """Similar questions answered earlier, with the SQL that answered them:
+{examples}
+Question to answer: {question}"""
+
+# Upper bound on the tool calls that batch_invoke, and on the analyses that
+# call_ds_agent_batch, runs at the same time.
+MAX_PARALLEL_TOOL_CALLS = 4
+
+_db_agent_cache = ResponseCache(ttl=RESPONSE_CACHE_TTL_SECS)
+_ds_agent_cache = ResponseCache(ttl=RESPONSE_CACHE_TTL_SECS)
+_search_agent_cache = ResponseCache(ttl=RESPONSE_CACHE_TTL_SECS)
 
+# Questions the database agent answered with a query that returned data.
+# Examples expire so that SQL written against an old schema is dropped.
+DB_AGENT_EXAMPLES_TTL_SECS = 60 * 60
+_db_agent_examples = ExampleStore(ttl=DB_AGENT_EXAMPLES_TTL_SECS)
+
+
+def _database_scope(tool_context: ToolContext) -> tuple:
+    """Data source and dataset that the database agent queries.
+
+    Scopes both the cached database agent responses and the few-shot
+    examples, so neither outlives a switch to another dataset.
+    """
+    database_settings = tool_context.state.get("database_settings") or {}
+    return (
+        active_source(tool_context),
+        database_settings.get("bq_project_id"),
+        database_settings.get("bq_dataset_id"),
+    )
+
+
+@cached_tool(
+    _db_agent_cache,
+    state_keys=(
+        "db_agent_output",
+        "query_result",
+        "query_result_fingerprint",
+        "sql_query",
+    ),
+    required_keys=("query_result",),
+    scope=_database_scope,
+)
 async def call_db_agent(
     question: str,
     tool_context: ToolContext,
 ):
     """Tool to call database (nl2sql) agent."""
-    print(
-        "\n call_db_agent.use_database:"
-        f' {tool_context.state["all_db_settings"]["use_database"]}'
+    logging.debug(
+        "call_db_agent.use_database: %s",
+        tool_context.state["all_db_settings"]["use_database"],
     )
 
-    agent_tool = AgentTool(agent=db_agent)
+    scope = _database_scope(tool_context)
+    examples = _db_agent_examples.search(scope, question)
+    if examples:
+        request = _DB_REQUEST_WITH_EXAMPLES.format(
+            examples="".join(
+                f"- Question: {example}\n  SQL: {sql}\n"
+                for example, sql in examples
+            ),
+            question=question,
+        )
+    else:
+        request = question
 
-    db_agent_output = await agent_tool.run_async(
-        args={"request": question}, tool_context=tool_context
+    previous_result = tool_context.state.get("query_result")
+    db_agent_output = await _DB_AGENT_TOOL.run_async(
+        args={"request": request}, tool_context=tool_context
     )
     tool_context.state["db_agent_output"] = db_agent_output
+    query_result = tool_context.state.get("query_result")
+    query_result_fingerprint = fingerprint(query_result)
+    tool_context.state["query_result_fingerprint"] = query_result_fingerprint
+
+    # A new query result (a new object, even if equal to the previous one)
+    # means the SQL in state ran and returned data
+    sql_query = tool_context.state.get("sql_query")
+    if (
+        db_agent_output
+        and sql_query
+        and query_result is not None
+        and query_result is not previous_result
+    ):
+        _db_agent_examples.add(scope, question, sql_query)
     return db_agent_output
 
 
@@ -51,35 +162,93 @@ async def call_ds_agent(
     tool_context: ToolContext,
 ):
     """Tool to call data science (nl2py) agent."""
-
     if question == "N/A":
         return tool_context.state["db_agent_output"]
+    return await _run_ds_agent(question, tool_context)
 
-    input_data = tool_context.state["query_result"]
 
-    question_with_data = f"""
-  Question to answer: {question}
-
-  Actual data to analyze prevoius quesiton is already in the following:
-  {input_data}
-
-  """
+# "N/A" calls never get here, so the response depends only on the question
+# and the query result.
+@cached_tool(
+    _ds_agent_cache,
+    state_keys=("ds_agent_output",),
+    context_keys=("query_result_fingerprint",),
+)
+async def _run_ds_agent(
+    question: str,
+    tool_context: ToolContext,
+):
+    """Run the data science agent on the question and the query result."""
+    data_format, input_data = _render_query_result(
+        tool_context.state["query_result"]
+    )
 
-    agent_tool = AgentTool(agent=ds_agent)
+    question_with_data = (
+        _DS_REQUEST_PREAMBLE.format(question=question, data_format=data_format)
+        + f"{input_data}\n\n  "
+    )
 
-    ds_agent_output = await agent_tool.run_async(
+    ds_agent_output = await _DS_AGENT_TOOL.run_async(
         args={"request": question_with_data}, tool_context=tool_context
     )
     tool_context.state["ds_agent_output"] = ds_agent_output
     return ds_agent_output
 
-def get_store_description() -> str:
+
+def _render_query_result(rows) -> Tuple[str, str]:
+    """Render query result rows for the data science agent's request.
+
+    Rows sharing the same columns are written as CSV: column names appear
+    once in a header row instead of in every row, as in the rows' Python
+    repr. Missing values are written as NULL; a string "NULL" then reads the
+    same, an ambiguity accepted for the shorter request. Anything else is
+    passed as its repr.
+
+    Returns:
+        The data format to note in the request ("" for a repr) and the data
     """
-    Retrieves the description of all available stores.
+    if not rows or not isinstance(rows, list):
+        return "", str(rows)
+    fieldnames = list(rows[0]) if isinstance(rows[0], dict) else None
+    if fieldnames is None or any(
+        not isinstance(row, dict) or list(row) != fieldnames for row in rows
+    ):
+        return "", str(rows)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(fieldnames)
+    writer.writerows(
+        ["NULL" if value is None else value for value in row.values()]
+        for row in rows
+    )
+    return _CSV_DATA_FORMAT, buffer.getvalue()
+
+
+async def call_ds_agent_batch(
+    questions: list[str],
+    tool_context: ToolContext,
+):
+    """Tool to call data science (nl2py) agent on independent questions.
+
+    The questions are analyzed concurrently against the same query result,
+    at most MAX_PARALLEL_TOOL_CALLS at a time.
+
+    Args:
+        questions: Sub-questions that do not depend on each other's answers.
 
     Returns:
-        str: Combined description of all available stores.
+        The data science agent's output for each question, in order.
     """
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOL_CALLS)
+
+    async def analyze(question: str):
+        async with semaphore:
+            return await call_ds_agent(question, tool_context)
+
+    return list(await asyncio.gather(*(analyze(q) for q in questions)))
+
+
 # Module-level constant for store descriptions
 STORE_DESCRIPTIONS = {
     "Discount Stickers": "Budget-friendly stickers for all occasions with thousands of designs. Features unique eco-friendly paper options popular with teachers and event planners who value sustainability without sacrificing quality.",
@@ -89,6 +258,9 @@ STORE_DESCRIPTIONS = {
     "Premium Sticker Mart": "Luxury holographic and metallic stickers using patented materials and 3D printing. Known for limited-edition artist collaborations and exceptional durability that appeals to collectors and designers."
 }
 
+# The descriptions never change, so join them once
+_STORE_DESCRIPTION_TEXT = "\n\n".join(STORE_DESCRIPTIONS.values())
+
 def get_store_description() -> str:
     """
     Retrieves the description of all available stores.
@@ -96,15 +268,151 @@ def get_store_description() -> str:
     Returns:
         str: Combined description of all available stores.
     """
-    # Return combined description of all stores
-    return "\n\n".join(STORE_DESCRIPTIONS.values())
-
-google_search_agent = Agent(
-    model=os.getenv("ROOT_AGENT_MODEL"),
-    name="google_search_agent",
-    description="Agent to answer questions using Google Search.",
-    instruction="You are an expert researcher. You always stick to the facts.",
-    tools=[google_search]
-)
+    return _STORE_DESCRIPTION_TEXT
+
+
+@functools.cache
+def _get_search_agent_tool() -> AgentTool:
+    """Build the Google Search agent tool on first use.
+
+    Processes that never search do not pay for the search agent's imports
+    and construction.
+    """
+    from google.adk.agents import Agent
+    from google.adk.tools import google_search
+
+    google_search_agent = Agent(
+        model=ROOT_AGENT_MODEL,
+        name="google_search_agent",
+        description="Agent to answer questions using Google Search.",
+        instruction="You are an expert researcher. You always stick to the facts.",
+        tools=[google_search]
+    )
+    return AgentTool(agent=google_search_agent)
+
+
+@cached_tool(_search_agent_cache)
+async def call_search_agent(
+    question: str,
+    tool_context: ToolContext,
+):
+    """Tool to call the Google Search agent."""
+    return await _get_search_agent_tool().run_async(
+        args={"request": question}, tool_context=tool_context
+    )
+
+
+def _batch_tools(profile: str) -> dict:
+    """The tools batch_invoke may call under an agent profile, by name."""
+    tools = {"call_db_agent": call_db_agent, "call_ds_agent": call_ds_agent}
+    if profile == "search":
+        tools["call_search_agent"] = call_search_agent
+        tools["get_store_description"] = get_store_description
+    return tools
+
+
+# batch_invoke only calls tools the root agent itself was given
+_BATCH_TOOLS = _batch_tools(AGENT_PROFILE)
+
+
+async def _batch_invoke(
+    tool_names: list[str],
+    questions: list[str],
+    tool_context: ToolContext,
+):
+    """Run batch_invoke's calls with the tools of the agent profile."""
+    if len(tool_names) != len(questions):
+        return [
+            {"error_message": "tool_names and questions must have the same length"}
+        ]
+
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOL_CALLS)
+    results = [None] * len(tool_names)
+
+    async def dispatch(i: int) -> None:
+        tool_name = tool_names[i]
+        tool = _BATCH_TOOLS.get(tool_name)
+        if tool is None:
+            results[i] = {
+                "tool_name": tool_name,
+                "error_message": f"Unknown tool: {tool_name}",
+            }
+            return
+
+        async with semaphore:
+            try:
+                if inspect.iscoroutinefunction(tool):
+                    result = await tool(questions[i], tool_context)
+                else:
+                    result = await asyncio.to_thread(tool)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                results[i] = {"tool_name": tool_name, "error_message": str(e)}
+                return
+        results[i] = {"tool_name": tool_name, "result": result}
+
+    async def dispatch_in_order(indices: list[int]) -> None:
+        for i in indices:
+            await dispatch(i)
+
+    db_calls = [i for i, name in enumerate(tool_names) if name == "call_db_agent"]
+    ds_calls = [i for i, name in enumerate(tool_names) if name == "call_ds_agent"]
+    other_calls = [
+        i for i in range(len(tool_names)) if i not in db_calls and i not in ds_calls
+    ]
+    await asyncio.gather(
+        dispatch_in_order(db_calls), *(dispatch(i) for i in other_calls)
+    )
+    await asyncio.gather(*(dispatch(i) for i in ds_calls))
+    return results
+
+
+
+# ADK builds a tool's declaration from the docstring in its code, so each
+# profile defines batch_invoke with the tools it may call.
+if AGENT_PROFILE == "search":
+
+    async def batch_invoke(
+        tool_names: list[str],
+        questions: list[str],
+        tool_context: ToolContext,
+    ):
+        """Tool to run several independent tool calls concurrently.
+
+        Database calls share the session's query result, so they run one
+        after another, and data science calls run once they are all done.
+        Search and store description calls run alongside the database calls.
+
+        Args:
+            tool_names: The tool of each call: call_db_agent, call_ds_agent,
+              call_search_agent or get_store_description.
+            questions: The question of each call, in the same order as
+              tool_names. get_store_description ignores its question.
+
+        Returns:
+            One entry per call, in order, holding either its "result" or an
+            "error_message".
+        """
+        return await _batch_invoke(tool_names, questions, tool_context)
+
+else:
+
+    async def batch_invoke(
+        tool_names: list[str],
+        questions: list[str],
+        tool_context: ToolContext,
+    ):
+        """Tool to run several independent tool calls concurrently.
+
+        Database calls share the session's query result, so they run one
+        after another, and data science calls run once they are all done.
+
+        Args:
+            tool_names: The tool of each call: call_db_agent or call_ds_agent.
+            questions: The question of each call, in the same order as
+              tool_names.
 
-call_search_agent = AgentTool(agent=google_search_agent)
+        Returns:
+            One entry per call, in order, holding either its "result" or an
+            "error_message".
+        """
+        return await _batch_invoke(tool_names, questions, tool_context)
@@ -0,0 +1,48 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared setup for the medo unit tests.
+
+Importing the medo package builds the root agent and its sub-agents, which
+needs Vertex AI credentials. The unit tests only exercise the modules around
+the agents, so the medo and medo.sub_agents packages are registered without
+running their __init__, and the sub-agents are replaced by stand-ins that
+tests never run.
+"""
+
+import os
+import sys
+import types
+
+from google.adk.agents import Agent
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(_ROOT)
+
+
+def _register_package(name: str, path: str) -> types.ModuleType:
+    """Register a package whose __init__ is not run."""
+    package = types.ModuleType(name)
+    package.__path__ = [path]
+    sys.modules[name] = package
+    return package
+
+
+if "medo" not in sys.modules:
+    _register_package("medo", os.path.join(_ROOT, "medo"))
+    sub_agents = _register_package(
+        "medo.sub_agents", os.path.join(_ROOT, "medo", "sub_agents")
+    )
+    sub_agents.db_agent = Agent(name="db_agent", model="stand-in")
+    sub_agents.ds_agent = Agent(name="ds_agent", model="stand-in")
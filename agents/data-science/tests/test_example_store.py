@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the database agent's few-shot example store."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from medo.shared_libraries.example_store import ExampleStore
+
+SCOPE = ("BigQuery", "project", "dataset")
+
+
+class TestExampleStore(unittest.TestCase):
+    """Test cases for ExampleStore."""
+
+    def test_similar_questions_are_found(self):
+        """Questions sharing most of their words are examples for each other."""
+        store = ExampleStore()
+        store.add(SCOPE, "Top 10 customers by revenue?", "SELECT 10")
+        store.add(SCOPE, "Total sales per store", "SELECT store")
+        self.assertEqual(
+            store.search(SCOPE, "top 20 customers by revenue"),
+            [("Top 10 customers by revenue?", "SELECT 10")],
+        )
+
+    def test_dissimilar_questions_are_not_found(self):
+        """Questions below the Jaccard threshold are not examples."""
+        store = ExampleStore(min_similarity=0.5)
+        # 2 shared tokens out of 6 distinct ones: similarity 1/3
+        store.add(SCOPE, "total sales per store", "SELECT store")
+        self.assertEqual(store.search(SCOPE, "total sales by month"), [])
+
+    def test_most_similar_questions_come_first(self):
+        """At most k examples are returned, most similar first."""
+        store = ExampleStore(min_similarity=0.1)
+        store.add(SCOPE, "sales per store", "SELECT 1")
+        store.add(SCOPE, "sales per store per month", "SELECT 2")
+        store.add(SCOPE, "sales per store per month in 2024", "SELECT 3")
+        self.assertEqual(
+            store.search(SCOPE, "sales per store per month", k=2),
+            [
+                ("sales per store per month", "SELECT 2"),
+                ("sales per store", "SELECT 1"),
+            ],
+        )
+
+    def test_examples_are_scoped(self):
+        """Examples recorded for one dataset are not used for another."""
+        store = ExampleStore()
+        store.add(SCOPE, "total sales per store", "SELECT store")
+        other_dataset = ("BigQuery", "project", "other_dataset")
+        self.assertEqual(store.search(other_dataset, "total sales per store"), [])
+
+    def test_examples_expire_after_ttl(self):
+        """Examples are dropped once their time-to-live has passed."""
+        store = ExampleStore(ttl=10)
+        with mock.patch("time.monotonic", return_value=100.0):
+            store.add(SCOPE, "total sales per store", "SELECT store")
+        with mock.patch("time.monotonic", return_value=105.0):
+            self.assertEqual(len(store.search(SCOPE, "total sales per store")), 1)
+        with mock.patch("time.monotonic", return_value=111.0):
+            self.assertEqual(store.search(SCOPE, "total sales per store"), [])
+
+    def test_oldest_example_is_dropped_when_full(self):
+        """Once full, the least recently recorded example is dropped."""
+        store = ExampleStore(maxsize=1)
+        store.add(SCOPE, "total sales per store", "SELECT store")
+        store.add(SCOPE, "total sales per month", "SELECT month")
+        self.assertEqual(
+            store.search(SCOPE, "total sales per store"),
+            [("total sales per month", "SELECT month")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
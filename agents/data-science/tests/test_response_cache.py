@@ -0,0 +1,196 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the orchestrator's tool response cache."""
+
+import asyncio
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from medo.shared_libraries.response_cache import (
+    ResponseCache,
+    cached_tool,
+    normalize_question,
+)
+
+
+def _tool_context(**state):
+    """A stand-in for ToolContext with its own session state."""
+    return types.SimpleNamespace(
+        state={"all_db_settings": {"use_database": "BigQuery"}, **state},
+        actions=types.SimpleNamespace(artifact_delta={}),
+    )
+
+
+def _db_tool(cache, rows):
+    """A cached tool that stores a fixed query result, like call_db_agent.
+
+    With rows set to None, the query fails and no result is stored.
+    """
+    calls = []
+
+    @cached_tool(
+        cache,
+        state_keys=("db_agent_output", "query_result"),
+        required_keys=("query_result",),
+    )
+    async def call_db_agent(question, tool_context):
+        calls.append(question)
+        if rows is None:
+            tool_context.state["db_agent_output"] = "The query is invalid."
+        else:
+            tool_context.state["query_result"] = list(rows)
+            tool_context.state["db_agent_output"] = f"{len(rows)} rows"
+        return tool_context.state["db_agent_output"]
+
+    return call_db_agent, calls
+
+
+class TestNormalizeQuestion(unittest.TestCase):
+    """Test cases for normalize_question."""
+
+    def test_trivial_rephrasings_share_a_key(self):
+        """Case, whitespace and a trailing question mark are ignored."""
+        self.assertEqual(
+            normalize_question("  Top 10 Customers?"),
+            normalize_question("top 10   customers"),
+        )
+
+    def test_different_meanings_do_not_share_a_key(self):
+        """Numbers, operators, signs and percentages are kept verbatim."""
+        pairs = [
+            ("Stores with sales > 1000", "Stores with sales < 1000"),
+            ("Stores with sales >= 1000", "Stores with sales = 1000"),
+            ("Stores with sales != 1000", "Stores with sales = 1000"),
+            ("growth of -5%", "growth of 5"),
+            ("top 10%", "top 10"),
+            ("top 10 customers", "top 20 customers"),
+            ("average price above 1.5", "average price above 15"),
+        ]
+        for first, second in pairs:
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(
+                    normalize_question(first), normalize_question(second)
+                )
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Once full, the entry unused for the longest is dropped."""
+        cache = ResponseCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_entries_expire_after_ttl(self):
+        """Entries are dropped once their time-to-live has passed."""
+        cache = ResponseCache(ttl=10)
+        with mock.patch("time.monotonic", return_value=100.0):
+            cache.put("a", 1)
+        with mock.patch("time.monotonic", return_value=105.0):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+
+    def test_clear_drops_every_entry(self):
+        """clear empties the cache."""
+        cache = ResponseCache()
+        cache.put("a", 1)
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+
+
+class TestCachedTool(unittest.TestCase):
+    """Test cases for the cached_tool decorator."""
+
+    def test_repeated_question_is_served_from_cache(self):
+        """A rephrased repeat does not call the tool again."""
+        call_db_agent, calls = _db_tool(ResponseCache(), [{"id": 1}])
+        tool_context = _tool_context()
+        asyncio.run(call_db_agent("Top customers?", tool_context))
+        output = asyncio.run(call_db_agent("top customers", tool_context))
+        self.assertEqual(output, "1 rows")
+        self.assertEqual(calls, ["Top customers?"])
+
+    def test_cache_hit_restores_unchanged_state_keys(self):
+        """Keys a call left unchanged are still replayed in other sessions."""
+        rows = [{"customer": "a", "total": 3}]
+        call_db_agent, calls = _db_tool(ResponseCache(), rows)
+
+        # The second question re-writes the very same rows in session A
+        session_a = _tool_context()
+        asyncio.run(call_db_agent("top customers", session_a))
+        asyncio.run(call_db_agent("top customers please", session_a))
+
+        session_b = _tool_context(query_result=[{"other": "result"}])
+        output = asyncio.run(call_db_agent("top customers please", session_b))
+        self.assertEqual(output, "1 rows")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(session_b.state["query_result"], rows)
+        self.assertEqual(session_b.state["db_agent_output"], "1 rows")
+
+    def test_failed_query_is_not_cached(self):
+        """A call that did not write its required keys is not cached."""
+        call_db_agent, calls = _db_tool(ResponseCache(), None)
+        tool_context = _tool_context(query_result=[{"id": 1}])
+        asyncio.run(call_db_agent("top customers", tool_context))
+        asyncio.run(call_db_agent("top customers", tool_context))
+        self.assertEqual(len(calls), 2)
+
+    def test_response_with_artifacts_is_not_cached(self):
+        """A call that saved artifacts is not cached."""
+        calls = []
+
+        @cached_tool(ResponseCache(), state_keys=("ds_agent_output",))
+        async def call_ds_agent(question, tool_context):
+            calls.append(question)
+            tool_context.actions.artifact_delta["plot.png"] = len(calls)
+            tool_context.state["ds_agent_output"] = "See the chart above."
+            return tool_context.state["ds_agent_output"]
+
+        asyncio.run(call_ds_agent("plot sales", _tool_context()))
+        asyncio.run(call_ds_agent("plot sales", _tool_context()))
+        self.assertEqual(len(calls), 2)
+
+    def test_entries_are_scoped(self):
+        """A response computed against one dataset is not served for another."""
+        calls = []
+
+        @cached_tool(
+            ResponseCache(),
+            scope=lambda tool_context: tool_context.state["dataset"],
+        )
+        async def call_db_agent(question, tool_context):
+            calls.append(tool_context.state["dataset"])
+            return "answer"
+
+        asyncio.run(call_db_agent("top customers", _tool_context(dataset="a")))
+        asyncio.run(call_db_agent("top customers", _tool_context(dataset="b")))
+        asyncio.run(call_db_agent("top customers", _tool_context(dataset="a")))
+        self.assertEqual(calls, ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
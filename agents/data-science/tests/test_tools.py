@@ -0,0 +1,205 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the orchestrator's tools."""
+
+import asyncio
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+from google.adk.tools import FunctionTool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from medo import tools
+
+
+def _tool_context(**state):
+    """A stand-in for ToolContext with its own session state."""
+    return types.SimpleNamespace(
+        state={"all_db_settings": {"use_database": "BigQuery"}, **state},
+        actions=types.SimpleNamespace(artifact_delta={}),
+    )
+
+
+class _RecordingAgentTool:
+    """A stand-in for AgentTool that records when each run starts and ends.
+
+    Runs of the database agent store a query result naming their request.
+    """
+
+    def __init__(self, name, events):
+        self._name = name
+        self._events = events
+
+    async def run_async(self, *, args, tool_context):
+        request = args["request"]
+        self._events.append(("start", self._name, request))
+        await asyncio.sleep(0.01)
+        if self._name == "db":
+            tool_context.state["query_result"] = [{"request": request}]
+            tool_context.state["sql_query"] = "SELECT 1"
+        self._events.append(("end", self._name, request))
+        return f"{self._name} answer"
+
+
+class TestBatchInvoke(unittest.TestCase):
+    """Test cases for batch_invoke."""
+
+    def setUp(self):
+        """Stub the sub-agents and start from empty caches."""
+        self.events = []
+        for name, attribute in (("db", "_DB_AGENT_TOOL"), ("ds", "_DS_AGENT_TOOL")):
+            patcher = mock.patch.object(
+                tools, attribute, _RecordingAgentTool(name, self.events)
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for cache in (tools._db_agent_cache, tools._ds_agent_cache):
+            cache.clear()
+        tools._db_agent_examples.clear()
+
+    def test_database_calls_run_one_after_another(self):
+        """A database call starts only once the previous one has ended."""
+        asyncio.run(
+            tools.batch_invoke(
+                ["call_db_agent", "call_db_agent", "call_db_agent"],
+                ["sales per day", "stores by region", "top customers"],
+                _tool_context(),
+            )
+        )
+        self.assertEqual(
+            [(kind, name) for kind, name, _ in self.events],
+            [("start", "db"), ("end", "db")] * 3,
+        )
+
+    def test_analysis_calls_start_after_the_last_database_call(self):
+        """call_ds_agent waits for every database call, wherever it is listed."""
+        tool_context = _tool_context()
+        results = asyncio.run(
+            tools.batch_invoke(
+                ["call_ds_agent", "call_db_agent", "call_db_agent"],
+                ["average sales", "sales per day", "top customers"],
+                tool_context,
+            )
+        )
+        last_db_end = max(
+            i for i, (kind, name, _) in enumerate(self.events)
+            if (kind, name) == ("end", "db")
+        )
+        ds_start = self.events.index(
+            next(event for event in self.events if event[:2] == ("start", "ds"))
+        )
+        self.assertGreater(ds_start, last_db_end)
+        self.assertEqual(
+            [result["result"] for result in results],
+            ["ds answer", "db answer", "db answer"],
+        )
+        # The analysis read the query result of the last database call
+        self.assertIn("top customers", self.events[ds_start][2])
+
+    def test_unknown_tool_returns_an_error_message(self):
+        """An unknown tool fails its own entry only."""
+        results = asyncio.run(
+            tools.batch_invoke(
+                ["call_db_agent", "drop_tables"],
+                ["sales per day", ""],
+                _tool_context(),
+            )
+        )
+        self.assertEqual(results[0]["result"], "db answer")
+        self.assertEqual(
+            results[1],
+            {"tool_name": "drop_tables", "error_message": "Unknown tool: drop_tables"},
+        )
+
+    def test_tools_outside_the_profile_are_unknown(self):
+        """The basic profile has no search, so batch_invoke cannot run it."""
+        with mock.patch.object(tools, "_BATCH_TOOLS", tools._batch_tools("basic")):
+            results = asyncio.run(
+                tools.batch_invoke(
+                    ["call_search_agent"], ["store opening hours"], _tool_context()
+                )
+            )
+        self.assertEqual(
+            results,
+            [
+                {
+                    "tool_name": "call_search_agent",
+                    "error_message": "Unknown tool: call_search_agent",
+                }
+            ],
+        )
+
+    def test_declaration_lists_the_profile_tools(self):
+        """The model is told about exactly the tools batch_invoke may call."""
+        declaration = FunctionTool(tools.batch_invoke)._get_declaration()
+        for name in (
+            "call_db_agent",
+            "call_ds_agent",
+            "call_search_agent",
+            "get_store_description",
+        ):
+            with self.subTest(name=name):
+                self.assertEqual(
+                    name in declaration.description, name in tools._BATCH_TOOLS
+                )
+
+    def test_mismatched_lengths_return_an_error_message(self):
+        """tool_names and questions must pair up."""
+        results = asyncio.run(
+            tools.batch_invoke(["call_db_agent"], [], _tool_context())
+        )
+        self.assertEqual(len(results), 1)
+        self.assertIn("error_message", results[0])
+        self.assertEqual(self.events, [])
+
+
+class TestRenderQueryResult(unittest.TestCase):
+    """Test cases for _render_query_result."""
+
+    def test_rows_with_the_same_columns_are_written_as_csv(self):
+        """Column names are written once, in a header row."""
+        data_format, data = tools._render_query_result(
+            [{"store": "a", "sales": 3}, {"store": "b, c", "sales": 4}]
+        )
+        self.assertEqual(data_format, tools._CSV_DATA_FORMAT)
+        self.assertEqual(data, 'store,sales\na,3\n"b, c",4\n')
+
+    def test_missing_values_are_written_as_null(self):
+        """None is written as NULL."""
+        _, data = tools._render_query_result([{"store": "a", "sales": None}])
+        self.assertEqual(data, "store,sales\na,NULL\n")
+
+    def test_other_results_are_passed_as_their_repr(self):
+        """Results that are not rows sharing their columns are not CSV."""
+        results = [
+            [],
+            None,
+            "The query is invalid.",
+            [("a", 3), ("b", 4)],
+            [{"store": "a"}, "b"],
+            [{"store": "a", "sales": 3}, {"store": "b"}],
+            [{"store": "a", "sales": 3}, {"sales": 4, "store": "b"}],
+        ]
+        for rows in results:
+            with self.subTest(rows=rows):
+                self.assertEqual(tools._render_query_result(rows), ("", str(rows)))
+
+
+if __name__ == "__main__":
+    unittest.main()